@@ -6,7 +6,10 @@ multiple factory methods, one of each type of object to be created.
 """
 
 
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping
+from itertools import repeat
 
 
 class Car(ABC):
@@ -67,6 +70,69 @@ class GasolineVehicleFactory(VehicleFactory):
         return GasolineBike()
 
 
+class SharedVehicleFactory(VehicleFactory):
+    """Factory returning one shared instance of each of a family's products.
+
+    Only suitable for stateless products, which every product here is.
+    """
+
+    def __init__(self, factory: VehicleFactory) -> None:
+        self._car = factory.create_car()
+        self._bike = factory.create_bike()
+
+    def create_car(self) -> Car:
+        return self._car
+
+    def create_bike(self) -> Bike:
+        return self._bike
+
+
+FAMILIES: dict[str, type[VehicleFactory]] = {
+    "electric": ElectricVehicleFactory,
+    "gasoline": GasolineVehicleFactory,
+}
+
+
+class FamilyTable:
+    """Vehicle family resolved once into a table of bound constructors."""
+
+    def __init__(self, family: str, shared: bool = False) -> None:
+        factory: VehicleFactory = FAMILIES[family]()
+        if shared:
+            factory = SharedVehicleFactory(factory)
+        self.family = family
+        self.shared = shared
+        self.create_car: Callable[[], Car] = factory.create_car
+        self.create_bike: Callable[[], Bike] = factory.create_bike
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, object]) -> "FamilyTable":
+        return cls(str(config["vehicle_family"]), bool(config.get("shared", False)))
+
+    def create_family_batch(self, n: int) -> list[tuple[Car, Bike]]:
+        if self.shared:
+            return [(self.create_car(), self.create_bike())] * n
+        create_car, create_bike = self.create_car, self.create_bike
+        return [(create_car(), create_bike()) for _ in repeat(None, n)]
+
+
+def benchmark(creations: int = 10_000_000) -> None:
+    pairs = creations // 2
+    factory: VehicleFactory = ElectricVehicleFactory()
+    start = time.perf_counter()
+    batch = [(factory.create_car(), factory.create_bike()) for _ in range(pairs)]
+    elapsed = time.perf_counter() - start
+    print(f"Factory methods: {creations} products in {elapsed:.3f}s")
+    del batch
+    for shared in (False, True):
+        table = FamilyTable("electric", shared)
+        start = time.perf_counter()
+        batch = table.create_family_batch(pairs)
+        elapsed = time.perf_counter() - start
+        print(f"FamilyTable(shared={shared}): {creations} products in {elapsed:.3f}s")
+        del batch
+
+
 if __name__ == "__main__":
     electric_factory = ElectricVehicleFactory()
     gasoline_factory = GasolineVehicleFactory()
@@ -74,3 +140,9 @@ if __name__ == "__main__":
     print(car.drive())
     bike = gasoline_factory.create_bike()
     print(bike.ride())
+
+    table = FamilyTable.from_config({"vehicle_family": "gasoline", "shared": True})
+    for car, bike in table.create_family_batch(2):
+        print(car.drive(), bike.ride())
+
+    benchmark(1_000_000)
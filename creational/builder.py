@@ -7,14 +7,46 @@ many possible configurations and is composed of numerous parts or components.
 
 
 from abc import ABC, abstractmethod
+from typing import Any
+
+
+class _Part:
+    """House part stored in a parts dict that may be shared with other houses."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, house: "House | None", owner: type | None = None) -> Any:
+        if house is None:
+            return self
+        return house._parts[self.name]
+
+    def __set__(self, house: "House", value: str) -> None:
+        if house._shared:
+            house._parts = dict(house._parts)
+            house._shared = False
+        house._parts[self.name] = value
 
 
 class House:
+    __slots__ = ("_parts", "_shared")
+
+    foundation = _Part()
+    structure = _Part()
+    roof = _Part()
+    interior = _Part()
+
     def __init__(self):
-        self.foundation = ""
-        self.structure = ""
-        self.roof = ""
-        self.interior = ""
+        self._parts = {"foundation": "", "structure": "", "roof": "", "interior": ""}
+        self._shared = False
+
+    def shared_copy(self) -> "House":
+        """Return a house sharing this one's parts until either changes a part."""
+        self._shared = True
+        house = House.__new__(House)
+        house._parts = self._parts
+        house._shared = True
+        return house
 
     def __str__(self) -> str:
         return (
@@ -26,6 +58,10 @@ class House:
 
 
 class HouseBuilder(ABC):
+    @abstractmethod
+    def reset(self) -> None:
+        pass
+
     @abstractmethod
     def build_foundation(self) -> None:
         pass
@@ -49,6 +85,9 @@ class HouseBuilder(ABC):
 
 class StoneHouseBuilder(HouseBuilder):
     def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
         self.house = House()
 
     def build_foundation(self) -> None:
@@ -69,6 +108,9 @@ class StoneHouseBuilder(HouseBuilder):
 
 class WoodHouseBuilder(HouseBuilder):
     def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
         self.house = House()
 
     def build_foundation(self) -> None:
@@ -94,6 +136,7 @@ class ConstructionEngineer:
         self.builder = builder
 
     def construct_house(self):
+        self.builder.reset()
         self.builder.build_foundation()
         self.builder.build_structure()
         self.builder.build_roof()
@@ -102,6 +145,16 @@ class ConstructionEngineer:
     def get_house(self) -> House:
         return self.builder.get_result()
 
+    def construct_many(self, n: int) -> list[House]:
+        """Construct `n` identical houses, running the builder's steps only once.
+
+        The houses share the parts of that one template house, and each copies them
+        the first time it changes a part.
+        """
+        self.construct_house()
+        template = self.get_house()
+        return [template.shared_copy() for _ in range(n)]
+
 
 if __name__ == "__main__":
     stone_builder = StoneHouseBuilder()
@@ -115,3 +168,8 @@ if __name__ == "__main__":
     engineer.construct_house()
     house = engineer.get_house()
     print(house)
+
+    houses = engineer.construct_many(3)
+    houses[0].roof = "thatch"
+    for house in houses:
+        print(house)
@@ -6,7 +6,13 @@ of objects that will be created.
 """
 
 
+import gc
+import re
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from importlib.metadata import EntryPoint, entry_points
+from itertools import repeat
 
 
 class Vehicle(ABC):
@@ -25,18 +31,169 @@ class Truck(Vehicle):
         return "Driving a truck"
 
 
+# "module:attribute" where both parts may be dotted.
+PLUGIN_PATH = re.compile(r"\w+(\.\w+)*:\w+(\.\w+)*")
+
+
 class VehicleFactory:
-    @staticmethod
-    def get_vehicle(vehicle_type: str) -> Vehicle:
-        if vehicle_type == "car":
-            return Car()
-        elif vehicle_type == "truck":
-            return Truck()
+    """Factory dispatching on a registry of vehicle types.
+
+    Types can be registered as classes or as "module:attribute" paths, where the
+    attribute may be dotted, and paths are imported only when that type is first
+    requested. Types published under the
+    `ENTRY_POINT_GROUP` entry point group are discovered on the first unknown
+    request, without importing them.
+    """
+
+    ENTRY_POINT_GROUP = "design_patterns.vehicles"
+
+    _registry: dict[str, type[Vehicle]] = {"car": Car, "truck": Truck}
+    _plugins: dict[str, EntryPoint] = {}
+    _discovered = False
+
+    @classmethod
+    def register(cls, vehicle_type: str, vehicle: type[Vehicle] | str) -> None:
+        if isinstance(vehicle, str):
+            if not PLUGIN_PATH.fullmatch(vehicle):
+                raise ValueError(f"Expected a 'module:attribute' path, got '{vehicle}'")
+            cls._registry.pop(vehicle_type, None)
+            cls._plugins[vehicle_type] = EntryPoint(
+                vehicle_type, vehicle, cls.ENTRY_POINT_GROUP
+            )
         else:
+            cls._plugins.pop(vehicle_type, None)
+            cls._registry[vehicle_type] = vehicle
+
+    @classmethod
+    def discover(cls) -> None:
+        for entry_point in entry_points(group=cls.ENTRY_POINT_GROUP):
+            cls._plugins.setdefault(entry_point.name, entry_point)
+        cls._discovered = True
+
+    @classmethod
+    def _load(cls, vehicle_type: str) -> type[Vehicle]:
+        if vehicle_type not in cls._plugins and not cls._discovered:
+            cls.discover()
+        entry_point = cls._plugins.get(vehicle_type)
+        if entry_point is None:
             raise ValueError("Unknown vehicle type")
+        vehicle = entry_point.load()
+        cls._registry[vehicle_type] = vehicle
+        return vehicle
+
+    @classmethod
+    def get_vehicle(cls, vehicle_type: str) -> Vehicle:
+        vehicle = cls._registry.get(vehicle_type)
+        if vehicle is None:
+            vehicle = cls._load(vehicle_type)
+        return vehicle()
+
+    @classmethod
+    def get_vehicles(cls, vehicle_type: str, n: int) -> list[Vehicle]:
+        vehicle = cls._registry.get(vehicle_type)
+        if vehicle is None:
+            vehicle = cls._load(vehicle_type)
+        return [vehicle() for _ in repeat(None, n)]
+
+
+class VehiclePool:
+    """Pool of reusable vehicles of one type.
+
+    Released vehicles are passed to `reset`, if given, and kept for the next
+    `acquire` while fewer than `max_size` are idle; beyond that they are dropped.
+    Releasing a vehicle that is already idle in the pool raises ValueError.
+    """
+
+    def __init__(
+        self,
+        vehicle_type: str,
+        max_size: int = 1024,
+        reset: Callable[[Vehicle], None] | None = None,
+    ) -> None:
+        self.vehicle_type = vehicle_type
+        self.max_size = max_size
+        self.reset = reset
+        # Idle vehicles keyed by identity, which also catches a double release.
+        self._idle: dict[int, Vehicle] = {}
+
+    def acquire(self) -> Vehicle:
+        try:
+            return self._idle.popitem()[1]
+        except KeyError:
+            return VehicleFactory.get_vehicle(self.vehicle_type)
+
+    def release(self, vehicle: Vehicle) -> None:
+        if id(vehicle) in self._idle:
+            raise ValueError("Vehicle has already been released")
+        if self.reset is not None:
+            self.reset(vehicle)
+        if len(self._idle) < self.max_size:
+            self._idle[id(vehicle)] = vehicle
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+
+def benchmark(ticks: int = 100, per_tick: int = 10_000) -> None:
+    pauses: list[float] = []
+    started: list[float] = []
+
+    def track_gc(phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            started.append(time.perf_counter())
+        elif started:
+            pauses.append(time.perf_counter() - started.pop())
+
+    def plain_tick() -> None:
+        vehicles = [VehicleFactory.get_vehicle("car") for _ in range(per_tick)]
+        del vehicles
+
+    def bulk_tick() -> None:
+        vehicles = VehicleFactory.get_vehicles("car", per_tick)
+        del vehicles
+
+    pool = VehiclePool("car", max_size=per_tick)
+
+    def pooled_tick() -> None:
+        vehicles = [pool.acquire() for _ in range(per_tick)]
+        for vehicle in vehicles:
+            pool.release(vehicle)
+
+    gc.callbacks.append(track_gc)
+    try:
+        for label, tick in (
+            ("get_vehicle", plain_tick),
+            ("get_vehicles", bulk_tick),
+            ("VehiclePool", pooled_tick),
+        ):
+            gc.collect()
+            pauses.clear()
+            start = time.perf_counter()
+            for _ in range(ticks):
+                tick()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label}: {ticks * per_tick} vehicles in {elapsed:.3f}s, "
+                f"{len(pauses)} GC pauses totalling {sum(pauses) * 1000:.2f}ms"
+            )
+    finally:
+        gc.callbacks.remove(track_gc)
 
 
 if __name__ == "__main__":
     vehicle_type = "car"
     vehicle = VehicleFactory.get_vehicle(vehicle_type)
     print(vehicle.drive())
+
+    VehicleFactory.register("lorry", f"{__name__}:Truck")
+    print(VehicleFactory.get_vehicle("lorry").drive())
+
+    trucks = VehicleFactory.get_vehicles("truck", 3)
+    print([truck.drive() for truck in trucks])
+
+    car_pool = VehiclePool("car", max_size=2)
+    pooled_car = car_pool.acquire()
+    car_pool.release(pooled_car)
+    print(f"Reused pooled car: {car_pool.acquire() is pooled_car}")
+
+    benchmark()
@@ -5,14 +5,225 @@ point of access to it. This pattern is often used for managing shared resources,
 like database connections or configurations.
 """
 
+import asyncio
+import os
+import threading
+import time
+import timeit
+import weakref
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
 
 class Singleton:
-    _instance = None
+    """Thread-safe singleton with one instance per subclass.
+
+    Creation uses double-checked locking, so once an instance exists the lookup
+    takes no lock. In a child process after `os.fork` the lock is replaced and the
+    instances are dropped, so the child builds its own.
+    """
+
+    _instances: dict[type, "Singleton"] = {}
+    _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(Singleton, cls).__new__(cls, *args, **kwargs)
-        return cls._instance
+        instance = Singleton._instances.get(cls)
+        if instance is None:
+            with Singleton._lock:
+                instance = Singleton._instances.get(cls)
+                if instance is None:
+                    instance = super().__new__(cls)
+                    Singleton._instances[cls] = instance
+        return instance
+
+    @staticmethod
+    def _reset_after_fork() -> None:
+        Singleton._lock = threading.Lock()
+        Singleton._instances = {}
+
+
+PROCESS = "process"
+THREAD = "thread"
+EVENT_LOOP = "event_loop"
+CONTEXT = "context"
+SCOPES = (PROCESS, THREAD, EVENT_LOOP, CONTEXT)
+
+
+_MISSING = object()
+
+
+class _Registration:
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        scope: str,
+        teardown: Callable[[Any], None] | None,
+    ) -> None:
+        self.factory = factory
+        self.scope = scope
+        self.teardown = teardown
+        self.constructions = 0
+        # Held while building a process-wide instance. Each registration has its own
+        # lock, so a factory can get() other process-scope instances it depends on.
+        self.lock = threading.RLock()
+
+
+class ScopedRegistry:
+    """Registry of lazily constructed instances, each shared within a scope.
+
+    - process: one instance per process
+    - thread: one instance per thread
+    - event_loop: one instance per running asyncio event loop
+    - context: one instance per context, inherited by contexts copied from it,
+      such as those of tasks it creates
+
+    A child process after `os.fork` starts with no instances in any scope.
+    """
+
+    def __init__(self) -> None:
+        self._registrations: dict[str, _Registration] = {}
+        self._lock = threading.Lock()
+        self._process: dict[str, Any] = {}
+        self._thread = threading.local()
+        self._loops: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, Any]
+        ] = weakref.WeakKeyDictionary()
+        # Context-scoped instances are tagged with the fork generation they were
+        # built in, so a forked child does not reuse its parent's.
+        self._generation = 0
+        self._context: ContextVar[tuple[int, dict[str, Any]] | None] = ContextVar(
+            f"scoped_registry_{id(self)}", default=None
+        )
+        _registries.add(self)
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        scope: str = PROCESS,
+        teardown: Callable[[Any], None] | None = None,
+    ) -> None:
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}'")
+        self._registrations[name] = _Registration(factory, scope, teardown)
+
+    def _instances(self, scope: str) -> dict[str, Any]:
+        if scope == PROCESS:
+            return self._process
+        if scope == THREAD:
+            try:
+                return self._thread.instances
+            except AttributeError:
+                self._thread.instances = {}
+                return self._thread.instances
+        if scope == EVENT_LOOP:
+            loop = asyncio.get_running_loop()
+            instances = self._loops.get(loop)
+            if instances is None:
+                with self._lock:
+                    instances = self._loops.setdefault(loop, {})
+            return instances
+        current = self._context.get()
+        if current is not None and current[0] == self._generation:
+            return current[1]
+        instances: dict[str, Any] = {}
+        self._context.set((self._generation, instances))
+        return instances
+
+    def get(self, name: str) -> Any:
+        registration = self._registrations[name]
+        instances = self._instances(registration.scope)
+        instance = instances.get(name, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        if registration.scope == PROCESS:
+            # Double-checked so only one thread builds the process-wide instance.
+            with registration.lock:
+                instance = instances.get(name, _MISSING)
+                if instance is _MISSING:
+                    instance = instances[name] = registration.factory()
+                    with self._lock:
+                        registration.constructions += 1
+            return instance
+        instance = instances[name] = registration.factory()
+        with self._lock:
+            registration.constructions += 1
+        return instance
+
+    def teardown(self, scope: str) -> None:
+        """Drop the current scope's instances, running their teardown hooks."""
+        instances = self._instances(scope)
+        with self._lock:
+            names = [name for name in instances if name in self._registrations]
+            dropped = [(name, instances.pop(name)) for name in names]
+        for name, instance in dropped:
+            hook = self._registrations[name].teardown
+            if hook is not None:
+                hook(instance)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            name: {
+                "scope": registration.scope,
+                "constructions": registration.constructions,
+            }
+            for name, registration in self._registrations.items()
+        }
+
+    def lookup_cost(self, name: str, number: int = 100_000) -> float:
+        """Return the average time in seconds of `get(name)` once constructed."""
+        self.get(name)
+        return timeit.timeit(lambda: self.get(name), number=number) / number
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        for registration in self._registrations.values():
+            registration.lock = threading.RLock()
+        self._process = {}
+        self._thread = threading.local()
+        self._loops = weakref.WeakKeyDictionary()
+        self._generation += 1
+
+
+_registries: weakref.WeakSet[ScopedRegistry] = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    Singleton._reset_after_fork()
+    for registry in _registries:
+        registry._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def benchmark(threads: int = 64, duration: float = 1.0) -> None:
+    calls = [0] * threads
+    seen: list[set[int]] = [set() for _ in range(threads)]
+    start = threading.Barrier(threads + 1)
+
+    def hammer(index: int) -> None:
+        start.wait()
+        deadline = time.perf_counter() + duration
+        count = 0
+        while time.perf_counter() < deadline:
+            seen[index].add(id(Singleton()))
+            count += 1
+        calls[index] = count
+
+    workers = [threading.Thread(target=hammer, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    for worker in workers:
+        worker.join()
+    instances = set().union(*seen)
+    print(
+        f"{threads} threads: {sum(calls) / duration:.0f} Singleton() calls/s, "
+        f"{len(instances)} instance(s)"
+    )
 
 
 if __name__ == "__main__":
@@ -20,3 +231,31 @@ if __name__ == "__main__":
     s2 = Singleton()
 
     print(f"s1 is s2: {s1 is s2}")
+
+    benchmark()
+
+    registry = ScopedRegistry()
+    registry.register("config", dict, PROCESS)
+    registry.register("connection", object, THREAD, teardown=print)
+    registry.register("client", object, EVENT_LOOP)
+
+    def use_connection() -> None:
+        registry.get("config")
+        registry.get("connection")
+        registry.get("connection")
+        registry.teardown(THREAD)
+
+    workers = [threading.Thread(target=use_connection) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    async def use_client() -> None:
+        registry.get("client")
+        registry.get("client")
+
+    asyncio.run(use_client())
+    asyncio.run(use_client())
+    print(registry.stats())
+    print(f"Process-scope lookup: {registry.lookup_cost('config') * 1e9:.0f}ns")
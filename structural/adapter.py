@@ -5,6 +5,12 @@ incompatible interfaces to work together. It involves a wrapper (the adapter) wh
 makes one existing class (the adaptee) compatible with another interface (the target).
 """
 
+import timeit
+from collections.abc import Mapping
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
 
 class EuropeanSocket:
     def charge(self) -> str:
@@ -25,7 +31,98 @@ class SocketAdapter(EuropeanSocket):
         return f"Adapting {power} to European charging standard"
 
 
+class AdapterRegistry:
+    """Registry of method mappings from which adapter classes are generated.
+
+    A mapping names, for each target method, the adaptee method that implements it.
+    The adapter class for a (target, adaptee type) pair is built once and cached.
+    Its instances bind every target method straight to the adaptee's bound method,
+    so a call through the adapter costs no more than calling the adaptee directly.
+    """
+
+    def __init__(self) -> None:
+        self._specs: dict[tuple[type, type], Mapping[str, str]] = {}
+        self._classes: dict[tuple[type, type], type] = {}
+
+    def register(
+        self, target: type, adaptee_type: type, methods: Mapping[str, str]
+    ) -> None:
+        self._specs[(target, adaptee_type)] = dict(methods)
+        # Subclasses of adaptee_type may have cached a class built from an older spec.
+        for key in [key for key in self._classes if key[0] is target]:
+            del self._classes[key]
+
+    def adapter_class(self, target: type[T], adaptee_type: type) -> type[T]:
+        key = (target, adaptee_type)
+        cls = self._classes.get(key)
+        if cls is None:
+            for base in adaptee_type.__mro__:
+                methods = self._specs.get((target, base))
+                if methods is not None:
+                    break
+            else:
+                raise TypeError(
+                    f"No adapter registered from {adaptee_type.__name__} "
+                    f"to {target.__name__}"
+                )
+            cls = self._build(target, adaptee_type, methods)
+            self._classes[key] = cls
+        return cls
+
+    def adapt(self, adaptee: Any, target: type[T]) -> T:
+        return self.adapter_class(target, type(adaptee))(adaptee)
+
+    @staticmethod
+    def _build(target: type, adaptee_type: type, methods: Mapping[str, str]) -> type:
+        items = tuple(methods.items())
+
+        def __init__(self: Any, adaptee: Any) -> None:
+            self.adaptee = adaptee
+            for target_name, adaptee_name in items:
+                setattr(self, target_name, getattr(adaptee, adaptee_name))
+
+        namespace: dict[str, Any] = {"__init__": __init__}
+        # Class-level delegates satisfy abstract targets; the bound methods set on
+        # each instance shadow them on the call path.
+        for target_name, adaptee_name in items:
+            namespace[target_name] = _delegate(adaptee_name)
+        name = f"{adaptee_type.__name__}To{target.__name__}Adapter"
+        return type(name, (target,), namespace)
+
+
+def _delegate(adaptee_name: str) -> Any:
+    def method(self: Any, *args: Any, **kwargs: Any) -> Any:
+        return getattr(self.adaptee, adaptee_name)(*args, **kwargs)
+
+    method.__name__ = adaptee_name
+    return method
+
+
+adapters = AdapterRegistry()
+adapters.register(EuropeanSocket, USASocket, {"charge": "power"})
+
+
+def benchmark(number: int = 1_000_000) -> None:
+    usa_socket = USASocket()
+    for label, adapter in (
+        ("SocketAdapter", SocketAdapter(usa_socket)),
+        ("generated adapter", adapters.adapt(usa_socket, EuropeanSocket)),
+    ):
+        elapsed = timeit.timeit(
+            "adapter.charge()", globals={"adapter": adapter}, number=number
+        )
+        print(f"{label}: {elapsed / number * 1e9:.1f}ns per charge")
+    elapsed = timeit.timeit(
+        "usa_socket.power()", globals={"usa_socket": usa_socket}, number=number
+    )
+    print(f"USASocket.power: {elapsed / number * 1e9:.1f}ns per call")
+
+
 if __name__ == "__main__":
     usa_socket = USASocket()
     adapter = SocketAdapter(usa_socket)
     print(adapter.charge())
+
+    generated_adapter = adapters.adapt(usa_socket, EuropeanSocket)
+    print(f"{type(generated_adapter).__name__}: {generated_adapter.charge()}")
+    benchmark()
@@ -5,7 +5,11 @@ from its implementation so that the two can vary independently. It's especially
 useful when both the abstraction and its implementation can have different hierarchies.
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
 
 
 class Device(ABC):
@@ -70,6 +74,265 @@ class AdvancedRemoteControl(RemoteControl):
         print("Device muted")
 
 
+class PowerChange:
+    def __init__(self, kind: str, turned_on: int, turned_off: int) -> None:
+        self.kind = kind
+        self.turned_on = turned_on
+        self.turned_off = turned_off
+
+    def __str__(self) -> str:
+        return f"{self.kind}: {self.turned_on} turned on, {self.turned_off} turned off"
+
+
+class DeviceFleet:
+    """Power state of many devices, one byte per device in a bytearray per kind."""
+
+    def __init__(self) -> None:
+        self.states: dict[str, bytearray] = {}
+
+    def add_devices(self, kind: str, count: int) -> range:
+        states = self.states.setdefault(kind, bytearray())
+        start = len(states)
+        states.extend(bytes(count))
+        return range(start, start + count)
+
+    def device(self, kind: str, index: int) -> "FleetDevice":
+        return FleetDevice(self.states[kind], index)
+
+    def count_on(self, kind: str) -> int:
+        return self.states[kind].count(1)
+
+
+class FleetDevice(Device):
+    """Device view onto one slot of a DeviceFleet, usable with RemoteControl."""
+
+    def __init__(self, states: bytearray, index: int) -> None:
+        self._states = states
+        self._index = index
+
+    def turn_on(self) -> None:
+        self._states[self._index] = 1
+
+    def turn_off(self) -> None:
+        self._states[self._index] = 0
+
+    def is_on(self) -> bool:
+        return bool(self._states[self._index])
+
+
+Selection = slice | Sequence[int] | None
+
+_TOGGLE = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+class FleetRemoteControl:
+    """Remote driving a selection of a fleet's devices of one kind in bulk.
+
+    A selection is a slice, a sequence of indices, or None for every device. Each
+    bulk operation notifies the listeners once with a PowerChange summary.
+    """
+
+    def __init__(self, fleet: DeviceFleet) -> None:
+        self.fleet = fleet
+        self._listeners: list[Callable[[PowerChange], None]] = []
+
+    def subscribe(self, listener: Callable[[PowerChange], None]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, change: PowerChange) -> None:
+        for listener in self._listeners:
+            listener(change)
+
+    def turn_on(self, kind: str, selection: Selection = None) -> None:
+        self._set(kind, selection, 1)
+
+    def turn_off(self, kind: str, selection: Selection = None) -> None:
+        self._set(kind, selection, 0)
+
+    def _set(self, kind: str, selection: Selection, value: int) -> None:
+        states = self.fleet.states[kind]
+        if selection is None or isinstance(selection, slice):
+            selected = slice(None) if selection is None else selection
+            before = states[selected]
+            changed = len(before) - before.count(value)
+            states[selected] = bytes([value]) * len(before)
+        else:
+            changed = 0
+            for index in selection:
+                if states[index] != value:
+                    states[index] = value
+                    changed += 1
+        turned_on, turned_off = (changed, 0) if value else (0, changed)
+        self._notify(PowerChange(kind, turned_on, turned_off))
+
+    def toggle_power(self, kind: str, selection: Selection = None) -> None:
+        states = self.fleet.states[kind]
+        if selection is None or isinstance(selection, slice):
+            selected = slice(None) if selection is None else selection
+            before = states[selected]
+            turned_off = before.count(1)
+            turned_on = len(before) - turned_off
+            states[selected] = before.translate(_TOGGLE)
+        else:
+            turned_on = turned_off = 0
+            for index in selection:
+                if states[index]:
+                    states[index] = 0
+                    turned_off += 1
+                else:
+                    states[index] = 1
+                    turned_on += 1
+        self._notify(PowerChange(kind, turned_on, turned_off))
+
+
+class AsyncDevice(ABC):
+    @abstractmethod
+    async def turn_on(self) -> None:
+        pass
+
+    @abstractmethod
+    async def turn_off(self) -> None:
+        pass
+
+    @abstractmethod
+    async def is_on(self) -> bool:
+        pass
+
+
+class ThreadedDevice(AsyncDevice):
+    """Runs a synchronous Device's calls on a worker thread.
+
+    A running thread cannot be interrupted, so a cancelled call only finishes, by
+    re-raising the cancellation, once its thread has returned.
+    """
+
+    def __init__(self, device: Device) -> None:
+        self.device = device
+
+    async def _call(self, method: Callable[[], Any]) -> Any:
+        future = asyncio.ensure_future(asyncio.to_thread(method))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    async def turn_on(self) -> None:
+        await self._call(self.device.turn_on)
+
+    async def turn_off(self) -> None:
+        await self._call(self.device.turn_off)
+
+    async def is_on(self) -> bool:
+        return await self._call(self.device.is_on)
+
+
+class SimulatedDevice(AsyncDevice):
+    """Device whose every call waits `latency` seconds, as if on I/O."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self._on = False
+
+    async def turn_on(self) -> None:
+        await asyncio.sleep(self.latency)
+        self._on = True
+
+    async def turn_off(self) -> None:
+        await asyncio.sleep(self.latency)
+        self._on = False
+
+    async def is_on(self) -> bool:
+        return self._on
+
+
+class AsyncRemoteControl:
+    """Remote driving many AsyncDevices concurrently.
+
+    At most `max_concurrency` devices are driven at once. A device call that takes
+    longer than `timeout` seconds fails with TimeoutError straight away and is
+    cancelled, but it keeps its concurrency slot until it has actually finished;
+    for a ThreadedDevice that is when its worker thread returns. Bulk operations
+    return one entry per device: None on success, or the exception the call raised.
+    Cancelling a bulk operation cancels all of its outstanding device calls.
+    """
+
+    def __init__(
+        self,
+        devices: Sequence[AsyncDevice],
+        max_concurrency: int = 100,
+        timeout: float | None = None,
+    ) -> None:
+        self.devices = devices
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _toggle(self, device: AsyncDevice) -> None:
+        if await device.is_on():
+            await device.turn_off()
+        else:
+            await device.turn_on()
+
+    async def _run(
+        self, operation: Callable[[AsyncDevice], Awaitable[None]], device: AsyncDevice
+    ) -> None:
+        await self._semaphore.acquire()
+        task = asyncio.ensure_future(operation(device))
+        task.add_done_callback(lambda _: self._semaphore.release())
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except BaseException:
+            task.cancel()
+            raise
+
+    async def _run_all(
+        self, operation: Callable[[AsyncDevice], Awaitable[None]]
+    ) -> list[BaseException | None]:
+        return await asyncio.gather(
+            *(self._run(operation, device) for device in self.devices),
+            return_exceptions=True,
+        )
+
+    async def toggle_power(self) -> list[BaseException | None]:
+        return await self._run_all(self._toggle)
+
+    async def turn_on(self) -> list[BaseException | None]:
+        return await self._run_all(lambda device: device.turn_on())
+
+    async def turn_off(self) -> list[BaseException | None]:
+        return await self._run_all(lambda device: device.turn_off())
+
+
+class AsyncAdvancedRemoteControl(AsyncRemoteControl):
+    async def mute(self) -> None:
+        print("Devices muted")
+
+
+async def benchmark(devices: int = 100, latency: float = 0.01) -> None:
+    fleet = [SimulatedDevice(latency) for _ in range(devices)]
+    start = time.perf_counter()
+    for device in fleet:
+        await device.turn_on()
+    sequential_elapsed = time.perf_counter() - start
+
+    remote = AsyncRemoteControl(fleet, max_concurrency=50)
+    start = time.perf_counter()
+    await remote.turn_off()
+    concurrent_elapsed = time.perf_counter() - start
+    print(f"Sequential: {devices} devices in {sequential_elapsed:.3f}s")
+    print(f"AsyncRemoteControl: {devices} devices in {concurrent_elapsed:.3f}s")
+
+
+async def drive_async_devices() -> None:
+    remote = AsyncAdvancedRemoteControl(
+        [ThreadedDevice(TV()), SimulatedDevice(0.01), SimulatedDevice(1.0)],
+        timeout=0.5,
+    )
+    for result in await remote.toggle_power():
+        print(f"Result: {result!r}")
+    await remote.mute()
+
+
 if __name__ == "__main__":
     tv = TV()
     remote = RemoteControl(tv)
@@ -79,3 +342,17 @@ if __name__ == "__main__":
     advanced_remote = AdvancedRemoteControl(radio)
     advanced_remote.toggle_power()
     advanced_remote.mute()
+
+    fleet = DeviceFleet()
+    fleet.add_devices("TV", 500_000)
+    fleet.add_devices("Radio", 1_000)
+    fleet_remote = FleetRemoteControl(fleet)
+    fleet_remote.subscribe(print)
+    fleet_remote.turn_on("TV", slice(0, 250_000))
+    fleet_remote.toggle_power("TV")
+    fleet_remote.turn_off("Radio", [1, 2, 3])
+    RemoteControl(fleet.device("Radio", 7)).toggle_power()
+    print(f"TVs on: {fleet.count_on('TV')}; Radios on: {fleet.count_on('Radio')}")
+
+    asyncio.run(drive_async_devices())
+    asyncio.run(benchmark())
@@ -6,50 +6,393 @@ clients treat individual objects and composition of object uniformly.
 """
 
 
+import fnmatch
+import os
+import sys
+import tempfile
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TextIO, TypeGuard
 
 
 class FileSystemComponent(ABC):
+    name: str
+    parent: "Directory | None"
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def file_count(self) -> int:
+        pass
+
+    @property
     @abstractmethod
-    def show_details(self) -> None:
+    def depth(self) -> int:
+        pass
+
+    @abstractmethod
+    def details(self) -> str:
+        pass
+
+    @abstractmethod
+    def show_details(self, out: TextIO | None = None) -> None:
         pass
 
 
 class File(FileSystemComponent):
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, size: int = 0) -> None:
         self.name = name
+        self.parent: Directory | None = None
+        self._size = size
 
-    def show_details(self) -> None:
-        print(f"File: {self.name}")
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @size.setter
+    def size(self, size: int) -> None:
+        delta = size - self._size
+        self._size = size
+        if self.parent is not None:
+            self.parent._patch(delta, 0)
+
+    @property
+    def file_count(self) -> int:
+        return 1
+
+    @property
+    def depth(self) -> int:
+        return 0
+
+    def details(self) -> str:
+        return f"File: {self.name}"
+
+    def show_details(self, out: TextIO | None = None) -> None:
+        print(self.details(), file=out)
 
 
 class Directory(FileSystemComponent):
+    """Directory caching the size, file count and depth of its subtree.
+
+    Size and file count are patched along the ancestor chain whenever the tree
+    changes, so adding a non-empty file or subtree costs O(depth). Depth, the number
+    of levels below this directory, is invalidated up the ancestor chain when a
+    change may affect it, stopping at the first ancestor already invalidated, and
+    recomputed from the children's cached values on the next read.
+    """
+
     def __init__(self, name: str) -> None:
         self.name = name
-        self.children: list[FileSystemComponent] = []
+        self.parent: Directory | None = None
+        self.children: dict[str, FileSystemComponent] = {}
+        self._size = 0
+        self._file_count = 0
+        self._depth = 0
+        self._depth_stale = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def file_count(self) -> int:
+        return self._file_count
+
+    @property
+    def depth(self) -> int:
+        if self._depth_stale:
+            self._refresh_depth()
+        return self._depth
 
     def add(self, component: FileSystemComponent) -> None:
-        self.children.append(component)
+        if component.name in self.children:
+            raise ValueError(f"'{component.name}' already exists in '{self.name}'")
+        if component.parent is not None:
+            raise ValueError(f"'{component.name}' already belongs to a directory")
+        if component is self or (
+            isinstance(component, Directory) and component.children
+        ):
+            # Only a directory with children can be an ancestor of this one.
+            ancestor: Directory | None = self
+            while ancestor is not None:
+                if ancestor is component:
+                    raise ValueError(f"'{component.name}' cannot contain itself")
+                ancestor = ancestor.parent
+        self.children[component.name] = component
+        component.parent = self
+        self._patch(component.size, component.file_count)
+        if not self._depth_stale and component.depth + 1 > self._depth:
+            self._invalidate_depth()
 
     def remove(self, component: FileSystemComponent) -> None:
-        self.children.remove(component)
+        if self.children.get(component.name) is not component:
+            raise ValueError(f"'{component.name}' is not in '{self.name}'")
+        del self.children[component.name]
+        component.parent = None
+        self._patch(-component.size, -component.file_count)
+        if component.depth + 1 >= self._depth:
+            self._invalidate_depth()
+
+    def _patch(self, size_delta: int, file_count_delta: int) -> None:
+        if not size_delta and not file_count_delta:
+            return
+        directory: Directory | None = self
+        while directory is not None:
+            directory._size += size_delta
+            directory._file_count += file_count_delta
+            directory = directory.parent
+
+    def _invalidate_depth(self) -> None:
+        directory: Directory | None = self
+        while directory is not None and not directory._depth_stale:
+            directory._depth_stale = True
+            directory = directory.parent
+
+    def _refresh_depth(self) -> None:
+        stack: list[Directory] = [self]
+        while stack:
+            directory = stack[-1]
+            stale = [
+                child
+                for child in directory.children.values()
+                if isinstance(child, Directory) and child._depth_stale
+            ]
+            if stale:
+                stack.extend(stale)
+                continue
+            stack.pop()
+            directory._depth = max(
+                (child.depth + 1 for child in directory.children.values()), default=0
+            )
+            directory._depth_stale = False
+
+    def get(self, name: str) -> FileSystemComponent | None:
+        return self.children.get(name)
 
-    def show_details(self) -> None:
-        print(f"Directory: {self.name}")
-        for child in self.children:
-            child.show_details()
+    def resolve(self, path: str) -> FileSystemComponent:
+        component: FileSystemComponent = self
+        for name in path.strip("/").split("/"):
+            if not name:
+                continue
+            if not isinstance(component, Directory) or name not in component.children:
+                raise KeyError(path)
+            component = component.children[name]
+        return component
+
+    def details(self) -> str:
+        return f"Directory: {self.name}"
+
+    def show_details(self, out: TextIO | None = None) -> None:
+        out = sys.stdout if out is None else out
+        out.writelines(f"{component.details()}\n" for _, component in preorder(self))
+
+
+Prune = Callable[[FileSystemComponent], bool]
+
+
+def _descends(
+    component: FileSystemComponent, level: int, max_depth: int | None
+) -> TypeGuard[Directory]:
+    return isinstance(component, Directory) and (max_depth is None or level < max_depth)
+
+
+def preorder(
+    root: FileSystemComponent, prune: Prune | None = None, max_depth: int | None = None
+) -> Iterator[tuple[int, FileSystemComponent]]:
+    """Yield (level, component) pairs, each directory before its children.
+
+    Components for which `prune` returns True are skipped along with their subtree,
+    and directories at `max_depth` are yielded without descending into them.
+    """
+    stack: list[tuple[int, FileSystemComponent]] = [(0, root)]
+    while stack:
+        level, component = stack.pop()
+        if prune is not None and prune(component):
+            continue
+        yield level, component
+        if _descends(component, level, max_depth):
+            children = reversed(component.children.values())
+            stack.extend((level + 1, child) for child in children)
+
+
+def postorder(
+    root: FileSystemComponent, prune: Prune | None = None, max_depth: int | None = None
+) -> Iterator[tuple[int, FileSystemComponent]]:
+    """Yield (level, component) pairs, each directory after its children."""
+    stack: list[tuple[int, FileSystemComponent, bool]] = [(0, root, False)]
+    while stack:
+        level, component, expanded = stack.pop()
+        if expanded:
+            yield level, component
+            continue
+        if prune is not None and prune(component):
+            continue
+        stack.append((level, component, True))
+        if _descends(component, level, max_depth):
+            children = reversed(component.children.values())
+            stack.extend((level + 1, child, False) for child in children)
+
+
+def breadth_first(
+    root: FileSystemComponent, prune: Prune | None = None, max_depth: int | None = None
+) -> Iterator[tuple[int, FileSystemComponent]]:
+    """Yield (level, component) pairs level by level."""
+    queue: deque[tuple[int, FileSystemComponent]] = deque([(0, root)])
+    while queue:
+        level, component = queue.popleft()
+        if prune is not None and prune(component):
+            continue
+        yield level, component
+        if _descends(component, level, max_depth):
+            queue.extend((level + 1, child) for child in component.children.values())
+
+
+# name, path, is_dir, size, (st_dev, st_ino)
+ScanEntry = tuple[str, str, bool, int, tuple[int, int]]
+
+
+def _scan_one(
+    path: str, follow_symlinks: bool, ignore: Sequence[str]
+) -> list[ScanEntry]:
+    entries: list[ScanEntry] = []
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                if any(fnmatch.fnmatch(entry.name, pattern) for pattern in ignore):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                    if not is_dir and entry.is_symlink() and not follow_symlinks:
+                        continue
+                    stat = entry.stat(follow_symlinks=follow_symlinks)
+                except OSError:
+                    continue
+                size = 0 if is_dir else stat.st_size
+                key = (stat.st_dev, stat.st_ino)
+                entries.append((entry.name, entry.path, is_dir, size, key))
+    except OSError:
+        pass
+    return entries
+
+
+def scan_filesystem(
+    path: str,
+    follow_symlinks: bool = False,
+    ignore: Sequence[str] = (),
+    max_depth: int | None = None,
+    max_workers: int | None = None,
+) -> Directory:
+    """Build a Directory tree mirroring `path` on disk.
+
+    Each directory is listed with `os.scandir` on a thread pool, one task per
+    subdirectory. Listings are added to the tree by the calling thread as they
+    complete, so the composite is only ever mutated from one thread. Names matching
+    any of the `ignore` glob patterns are skipped, and when following symlinks each
+    directory is visited at most once.
+    """
+    root = Directory(os.path.basename(os.path.abspath(path)))
+    stat = os.stat(path)
+    visited = {(stat.st_dev, stat.st_ino)}
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending: dict[Future[list[ScanEntry]], tuple[Directory, int]] = {
+            executor.submit(_scan_one, path, follow_symlinks, ignore): (root, 0)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directory, level = pending.pop(future)
+                for name, entry_path, is_dir, size, key in future.result():
+                    if not is_dir:
+                        directory.add(File(name, size))
+                        continue
+                    if key in visited:
+                        continue
+                    visited.add(key)
+                    child = Directory(name)
+                    directory.add(child)
+                    if max_depth is None or level + 1 < max_depth:
+                        task = executor.submit(
+                            _scan_one, entry_path, follow_symlinks, ignore
+                        )
+                        pending[task] = (child, level + 1)
+    return root
+
+
+def walk_filesystem(path: str) -> Directory:
+    """Build a Directory tree with a single-threaded `os.walk`."""
+    root = Directory(os.path.basename(os.path.abspath(path)))
+    directories = {path: root}
+    for dirpath, dirnames, filenames in os.walk(path):
+        directory = directories[dirpath]
+        for name in dirnames:
+            child = Directory(name)
+            directory.add(child)
+            directories[os.path.join(dirpath, name)] = child
+        for name in filenames:
+            size = os.stat(os.path.join(dirpath, name)).st_size
+            directory.add(File(name, size))
+    return root
+
+
+def benchmark(entries: int = 1_000_000, fanout: int = 100) -> None:
+    with tempfile.TemporaryDirectory() as path:
+        created = 0
+        level = [path]
+        while created < entries:
+            next_level = []
+            for parent in level:
+                for i in range(fanout):
+                    if created >= entries:
+                        break
+                    if i % 10 == 0:
+                        child = os.path.join(parent, f"dir{i}")
+                        os.mkdir(child)
+                        next_level.append(child)
+                    else:
+                        with open(os.path.join(parent, f"file{i}"), "wb") as file:
+                            file.write(b"x" * i)
+                    created += 1
+            level = next_level
+
+        for label, build in (
+            ("os.walk", walk_filesystem),
+            ("scan_filesystem", scan_filesystem),
+        ):
+            start = time.perf_counter()
+            root = build(path)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label}: {root.file_count} files, {root.size} bytes "
+                f"in {elapsed:.3f}s"
+            )
 
 
 if __name__ == "__main__":
     root = Directory("root")
     dir1 = Directory("dir1")
     dir2 = Directory("dir2")
-    file1 = File("file1")
-    file2 = File("file2")
-    file3 = File("file3")
+    file1 = File("file1", 100)
+    file2 = File("file2", 200)
+    file3 = File("file3", 300)
     dir1.add(file1)
     dir2.add(file2)
     dir2.add(file3)
     root.add(dir1)
     root.add(dir2)
     root.show_details()
+    for level, component in breadth_first(root, prune=lambda c: c.name == "dir1"):
+        print(f"{'  ' * level}{component.details()}")
+    print(root.resolve("dir2/file3").name)
+    dir2.remove(file2)
+    root.show_details()
+    file3.size = 50
+    print(f"Size: {root.size}; Files: {root.file_count}; Depth: {root.depth}")
+
+    benchmark(entries=20_000)
@@ -6,7 +6,13 @@ behavior of other objects from the same class.
 """
 
 
+import random
+import time
 from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import repeat
+from operator import add, mul
 
 
 class Coffee(ABC):
@@ -28,6 +34,8 @@ class SimpleCoffee(Coffee):
 
 
 class CoffeeDecorator(Coffee):
+    price = 0.0
+
     def __init__(self, decorated_coffee: Coffee):
         self.decorated_coffee = decorated_coffee
 
@@ -39,21 +47,106 @@ class CoffeeDecorator(Coffee):
 
 
 class MilkDecorator(CoffeeDecorator):
+    price = 0.5
+
     def get_cost(self) -> float:
-        return super().get_cost() + 0.5
+        return super().get_cost() + self.price
 
     def get_ingredients(self) -> str:
         return super().get_ingredients() + ", Milk"
 
 
 class SugarDecorator(CoffeeDecorator):
+    price = 0.2
+
     def get_cost(self) -> float:
-        return super().get_cost() + 0.2
+        return super().get_cost() + self.price
 
     def get_ingredients(self) -> str:
         return super().get_ingredients() + ", Sugar"
 
 
+class CompiledCoffee(Coffee):
+    """Flat coffee with the cost and ingredients of a decorator stack precomputed."""
+
+    def __init__(self, cost: float, ingredients: str) -> None:
+        self._cost = cost
+        self._ingredients = ingredients
+
+    def get_cost(self) -> float:
+        return self._cost
+
+    def get_ingredients(self) -> str:
+        return self._ingredients
+
+
+_compiled: dict[tuple[type[Coffee], ...], CompiledCoffee] = {}
+
+
+def compile_coffee(coffee: Coffee) -> CompiledCoffee:
+    """Collapse a decorator stack into a single CompiledCoffee.
+
+    Stacks are identified by the classes of their layers, so identical stacks share
+    one compiled object. This assumes decorators carry no state of their own.
+    """
+    layers: list[type[Coffee]] = []
+    component = coffee
+    while isinstance(component, CoffeeDecorator):
+        layers.append(type(component))
+        component = component.decorated_coffee
+    layers.append(type(component))
+    key = tuple(layers)
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = CompiledCoffee(coffee.get_cost(), coffee.get_ingredients())
+        _compiled[key] = compiled
+    return compiled
+
+
+def price_orders(
+    coffee: Coffee, add_ons: Mapping[type[CoffeeDecorator], Sequence[int]]
+) -> array:
+    """Price a batch of orders given as one count column per decorator class.
+
+    Order i is `coffee` with `add_ons[cls][i]` layers of each decorator `cls`. Costs
+    are accumulated one column at a time from the `price` each decorator class
+    defines, without building a decorator chain per order.
+    """
+    lengths = {len(counts) for counts in add_ons.values()}
+    if len(lengths) > 1:
+        raise ValueError("All add-on columns must have the same length")
+    n = lengths.pop() if lengths else 0
+    costs: Sequence[float] = [coffee.get_cost()] * n
+    for decorator, counts in add_ons.items():
+        costs = list(map(add, costs, map(mul, counts, repeat(decorator.price))))
+    return array("d", costs)
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    rng = random.Random(0)
+    milk = [rng.randrange(3) for _ in range(n)]
+    sugar = [rng.randrange(3) for _ in range(n)]
+
+    start = time.perf_counter()
+    per_object = []
+    for milk_count, sugar_count in zip(milk, sugar):
+        coffee: Coffee = SimpleCoffee()
+        for _ in range(milk_count):
+            coffee = MilkDecorator(coffee)
+        for _ in range(sugar_count):
+            coffee = SugarDecorator(coffee)
+        per_object.append(coffee.get_cost())
+    per_object_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = price_orders(SimpleCoffee(), {MilkDecorator: milk, SugarDecorator: sugar})
+    batch_elapsed = time.perf_counter() - start
+
+    assert all(abs(a - b) < 1e-9 for a, b in zip(per_object, batch))
+    print(f"Per-object pricing of {n} orders: {per_object_elapsed:.3f}s")
+    print(f"price_orders for {n} orders: {batch_elapsed:.3f}s")
+
+
 if __name__ == "__main__":
     simple_coffee = SimpleCoffee()
     print(
@@ -69,3 +162,17 @@ if __name__ == "__main__":
     print(
         f"Cost: {sugar_milk_coffee.get_cost()}; Ingredients: {sugar_milk_coffee.get_ingredients()}"
     )
+
+    compiled_coffee = compile_coffee(sugar_milk_coffee)
+    print(
+        f"Cost: {compiled_coffee.get_cost()}; Ingredients: {compiled_coffee.get_ingredients()}"
+    )
+    same_stack = SugarDecorator(MilkDecorator(SimpleCoffee()))
+    print(f"Shared compiled stack: {compile_coffee(same_stack) is compiled_coffee}")
+
+    costs = price_orders(
+        SimpleCoffee(), {MilkDecorator: [0, 1, 2], SugarDecorator: [1, 1, 0]}
+    )
+    print(f"Batch costs: {list(costs)}")
+
+    benchmark(100_000)
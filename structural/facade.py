@@ -7,6 +7,14 @@ pattern, we can make a complex subsystem easier to use or reduce dependencies on
 external code.
 """
 
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import cached_property
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
 
 class Projector:
     def on(self) -> None:
@@ -32,6 +40,84 @@ class DVDPlayer:
         print("Stopped movie")
 
 
+class Step:
+    def __init__(
+        self, name: str, action: Callable[[], None], after: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.action = action
+        self.after = after
+
+
+def _timed(action: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def run_steps(
+    steps: Sequence[Step], max_workers: int | None = None
+) -> dict[str, float]:
+    """Run steps on a thread pool, each once all the steps it comes after are done.
+
+    Independent steps run concurrently on pool threads, so anything they print can
+    interleave. Returns how long each step took in seconds. If a step raises, no
+    further steps are started and the exception propagates.
+    """
+    by_name = {step.name: step for step in steps}
+    if len(by_name) != len(steps):
+        counts = Counter(step.name for step in steps)
+        duplicates = [name for name, count in counts.items() if count > 1]
+        raise ValueError(f"Duplicate step names: {', '.join(duplicates)}")
+    for step in steps:
+        for dependency in step.after:
+            if dependency not in by_name:
+                raise ValueError(
+                    f"Step '{step.name}' depends on unknown step '{dependency}'"
+                )
+    _check_acyclic(steps)
+    waiting = {step.name: set(step.after) for step in steps}
+    timings: dict[str, float] = {}
+    with ThreadPoolExecutor(max_workers) as executor:
+        running: dict[Future[float], str] = {}
+
+        def start_ready() -> None:
+            for name, dependencies in list(waiting.items()):
+                if not dependencies:
+                    del waiting[name]
+                    running[executor.submit(_timed, by_name[name].action)] = name
+
+        start_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                timings[name] = future.result()
+                for dependencies in waiting.values():
+                    dependencies.discard(name)
+            start_ready()
+    return timings
+
+
+def _check_acyclic(steps: Sequence[Step]) -> None:
+    """Raise ValueError if the step dependencies form a cycle (Kahn's algorithm)."""
+    remaining = {step.name: len(set(step.after)) for step in steps}
+    dependents: dict[str, list[str]] = {step.name: [] for step in steps}
+    for step in steps:
+        for dependency in set(step.after):
+            dependents[dependency].append(step.name)
+    ready = [name for name, count in remaining.items() if not count]
+    while ready:
+        name = ready.pop()
+        del remaining[name]
+        for dependent in dependents[name]:
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                ready.append(dependent)
+    if remaining:
+        raise ValueError(f"Steps with cyclic dependencies: {', '.join(remaining)}")
+
+
 class HomeTheaterFacade:
     def __init__(
         self, projector: Projector, sound_system: SoundSystem, dvd_player: DVDPlayer
@@ -40,17 +126,130 @@ class HomeTheaterFacade:
         self.sound_system = sound_system
         self.dvd_player = dvd_player
 
-    def watch_movie(self, movie_title: str) -> None:
+    def watch_movie(self, movie_title: str) -> dict[str, float]:
         print("Get ready to watch a movie...")
-        self.projector.on()
-        self.sound_system.activate_surround_sound()
-        self.dvd_player.play_movie(movie_title)
+        return run_steps(
+            [
+                Step("projector", self.projector.on),
+                Step("sound", self.sound_system.activate_surround_sound),
+                Step(
+                    "movie",
+                    lambda: self.dvd_player.play_movie(movie_title),
+                    after=("projector", "sound"),
+                ),
+            ]
+        )
 
-    def end_movie(self) -> None:
+    def end_movie(self) -> dict[str, float]:
         print("Shutting movie theater down...")
-        self.dvd_player.stop_movie()
-        self.sound_system.deactivate_surround_sound()
-        self.projector.off()
+        return run_steps(
+            [
+                Step("movie", self.dvd_player.stop_movie),
+                Step(
+                    "sound",
+                    self.sound_system.deactivate_surround_sound,
+                    after=("movie",),
+                ),
+                Step("projector", self.projector.off, after=("movie",)),
+            ]
+        )
+
+
+class LazyHomeTheaterFacade(HomeTheaterFacade):
+    """Facade that builds each subsystem from its factory on first use."""
+
+    def __init__(
+        self,
+        projector_factory: Callable[[], Projector] = Projector,
+        sound_system_factory: Callable[[], SoundSystem] = SoundSystem,
+        dvd_player_factory: Callable[[], DVDPlayer] = DVDPlayer,
+    ) -> None:
+        self._projector_factory = projector_factory
+        self._sound_system_factory = sound_system_factory
+        self._dvd_player_factory = dvd_player_factory
+
+    @cached_property
+    def projector(self) -> Projector:
+        return self._projector_factory()
+
+    @cached_property
+    def sound_system(self) -> SoundSystem:
+        return self._sound_system_factory()
+
+    @cached_property
+    def dvd_player(self) -> DVDPlayer:
+        return self._dvd_player_factory()
+
+    def warm_up(self) -> None:
+        for subsystem in ("projector", "sound_system", "dvd_player"):
+            getattr(self, subsystem)
+
+
+class FacadePool:
+    """Pool of pre-warmed facades that requests check out and return.
+
+    `min_idle` facades are built and warmed up front. A checked-out facade that fails
+    `health_check` is discarded in favour of another, and facades idle for longer
+    than `max_idle` seconds are evicted down to `min_idle`. At most `max_idle_count`
+    facades are kept idle.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], LazyHomeTheaterFacade] = LazyHomeTheaterFacade,
+        min_idle: int = 2,
+        max_idle_count: int = 8,
+        max_idle: float = 300.0,
+        health_check: Callable[[HomeTheaterFacade], bool] = lambda facade: True,
+    ) -> None:
+        self.factory = factory
+        self.min_idle = min_idle
+        self.max_idle_count = max_idle_count
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self._idle: list[tuple[float, LazyHomeTheaterFacade]] = []
+        self._lock = threading.Lock()
+        for _ in range(min_idle):
+            self._idle.append((time.monotonic(), self._create()))
+
+    def _create(self) -> LazyHomeTheaterFacade:
+        facade = self.factory()
+        facade.warm_up()
+        return facade
+
+    def acquire(self) -> LazyHomeTheaterFacade:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                _, facade = self._idle.pop()
+            if self.health_check(facade):
+                return facade
+        return self._create()
+
+    def release(self, facade: LazyHomeTheaterFacade) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle_count:
+                self._idle.append((time.monotonic(), facade))
+        self.evict_idle()
+
+    def evict_idle(self) -> None:
+        deadline = time.monotonic() - self.max_idle
+        with self._lock:
+            # The least recently released facades are at the front.
+            while len(self._idle) > self.min_idle and self._idle[0][0] < deadline:
+                self._idle.pop(0)
+
+    @contextmanager
+    def checkout(self) -> Iterator[LazyHomeTheaterFacade]:
+        facade = self.acquire()
+        try:
+            yield facade
+        finally:
+            self.release(facade)
+
+    def __len__(self) -> int:
+        return len(self._idle)
 
 
 if __name__ == "__main__":
@@ -58,5 +257,15 @@ if __name__ == "__main__":
     sound_system = SoundSystem()
     dvd_player = DVDPlayer()
     home_theater = HomeTheaterFacade(projector, sound_system, dvd_player)
-    home_theater.watch_movie("The Matrix")
-    home_theater.end_movie()
+    for name, elapsed in home_theater.watch_movie("The Matrix").items():
+        print(f"{name}: {elapsed * 1000:.3f}ms")
+    for name, elapsed in home_theater.end_movie().items():
+        print(f"{name}: {elapsed * 1000:.3f}ms")
+
+    lazy_home_theater = LazyHomeTheaterFacade()
+    lazy_home_theater.end_movie()
+
+    pool = FacadePool(min_idle=2, max_idle=0.0)
+    with pool.checkout() as pooled_home_theater:
+        pooled_home_theater.watch_movie("Inception")
+    print(f"Idle facades: {len(pool)}")
@@ -6,6 +6,21 @@ particularly useful when dealing with a large number of objects that have some s
 state.
 """
 
+import heapq
+import mmap
+import os
+import random
+import struct
+import threading
+import tempfile
+import time
+import tracemalloc
+import weakref
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from typing import NoReturn
+
 
 class TreeType:
     def __init__(self, name: str, color: str, texture: str) -> None:
@@ -21,16 +36,40 @@ class TreeType:
 
 
 class TreeFactory:
-    _tree_types: dict[str, TreeType] = {}
+    """Interning cache of TreeTypes keyed on their full intrinsic state.
+
+    Types are held weakly, so a TreeType no tree refers to any more is evicted.
+    Lookups are serialized by a lock, which also keeps the hit/miss counters exact.
+    """
+
+    _tree_types: weakref.WeakValueDictionary[
+        tuple[str, str, str], TreeType
+    ] = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
 
     @classmethod
     def get_tree_type(cls, name: str, color: str, texture: str) -> TreeType:
-        if not cls._tree_types.get(name):
-            cls._tree_types[name] = TreeType(name, color, texture)
-            print("Creating new TreeType")
-        else:
-            print("Reusing existing TreeType")
-        return cls._tree_types[name]
+        key = (name, color, texture)
+        with cls._lock:
+            tree_type = cls._tree_types.get(key)
+            if tree_type is None:
+                tree_type = TreeType(name, color, texture)
+                cls._tree_types[key] = tree_type
+                cls.misses += 1
+            else:
+                cls.hits += 1
+        return tree_type
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        with cls._lock:
+            return {
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "size": len(cls._tree_types),
+            }
 
 
 class Tree:
@@ -46,23 +85,467 @@ class Tree:
 
 class Forest:
     def __init__(self) -> None:
-        self.trees: tuple[Tree, ...] = ()
+        self.trees: list[Tree] = []
 
     def plant_tree(
         self, x: int, y: int, age: int, name: str, color: str, texture: str
     ) -> None:
         tree_type = TreeFactory.get_tree_type(name, color, texture)
         tree = Tree(x, y, age, tree_type)
-        self.trees += (tree,)
+        self.trees.append(tree)
 
     def display_forest(self):
         for tree in self.trees:
             tree.display()
 
 
+FOREST_MAGIC = b"FRST"
+FOREST_VERSION = 1
+BYTE_ORDER_MARK = 0xFEFF
+# magic, version, byte order mark, tree count, tree type count
+FOREST_HEADER = struct.Struct("=4sHHII")
+STRING_LENGTH = struct.Struct("=H")
+# Largest index the unsigned short type id column can hold.
+MAX_TYPE_ID = 2 ** (8 * array("H").itemsize) - 1
+
+
+class UniformGrid:
+    """Spatial index bucketing tree indices into square cells of `cell_size`."""
+
+    def __init__(self, cell_size: int) -> None:
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self.cells: defaultdict[tuple[int, int], array] = defaultdict(
+            lambda: array("I")
+        )
+        self._bounds: tuple[int, int, int, int] | None = None
+
+    def _cell(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.cell_size, y // self.cell_size
+
+    def insert(self, index: int, x: int, y: int) -> None:
+        cx, cy = self._cell(x, y)
+        self.cells[(cx, cy)].append(index)
+        if self._bounds is None:
+            self._bounds = (cx, cy, cx, cy)
+        else:
+            min_cx, min_cy, max_cx, max_cy = self._bounds
+            self._bounds = (
+                min(min_cx, cx),
+                min(min_cy, cy),
+                max(max_cx, cx),
+                max(max_cy, cy),
+            )
+
+    def query(
+        self,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int,
+        xs: Sequence[int],
+        ys: Sequence[int],
+    ) -> Iterator[int]:
+        """Yield indices of all points with x0 <= x <= x1 and y0 <= y <= y1.
+
+        Only cells within both the query and the occupied bounds are visited, and
+        when those outnumber the occupied cells, the occupied cells are scanned
+        instead.
+        """
+        if self._bounds is None:
+            return
+        bound_min_cx, bound_min_cy, bound_max_cx, bound_max_cy = self._bounds
+        min_cx, min_cy = self._cell(x0, y0)
+        max_cx, max_cy = self._cell(x1, y1)
+        min_cx, min_cy = max(min_cx, bound_min_cx), max(min_cy, bound_min_cy)
+        max_cx, max_cy = min(max_cx, bound_max_cx), min(max_cy, bound_max_cy)
+        if min_cx > max_cx or min_cy > max_cy:
+            return
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self.cells):
+            cells = [
+                cell
+                for (cx, cy), cell in self.cells.items()
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+            ]
+        else:
+            cells = [
+                self.cells[(cx, cy)]
+                for cx in range(min_cx, max_cx + 1)
+                for cy in range(min_cy, max_cy + 1)
+                if (cx, cy) in self.cells
+            ]
+        for cell in cells:
+            for i in cell:
+                if x0 <= xs[i] <= x1 and y0 <= ys[i] <= y1:
+                    yield i
+
+    def nearest(
+        self, x: int, y: int, k: int, xs: Sequence[int], ys: Sequence[int]
+    ) -> list[int]:
+        """Return indices of the k points closest to (x, y), nearest first.
+
+        Cells are visited in square rings around the query cell, and the search
+        stops once no unvisited ring can hold a point closer than the current k-th.
+        """
+        if k <= 0 or self._bounds is None:
+            return []
+        cx, cy = self._cell(x, y)
+        min_cx, min_cy, max_cx, max_cy = self._bounds
+        max_ring = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy)
+        best: list[tuple[int, int]] = []
+        for r in range(max_ring + 1):
+            if len(best) == k and ((r - 1) * self.cell_size) ** 2 > -best[0][0]:
+                break
+            for cell_x in range(cx - r, cx + r + 1):
+                for cell_y in range(cy - r, cy + r + 1):
+                    if max(abs(cell_x - cx), abs(cell_y - cy)) != r:
+                        continue
+                    cell = self.cells.get((cell_x, cell_y))
+                    if cell is None:
+                        continue
+                    for i in cell:
+                        distance = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                        if len(best) < k:
+                            heapq.heappush(best, (-distance, i))
+                        elif distance < -best[0][0]:
+                            heapq.heapreplace(best, (-distance, i))
+        return [i for _, i in sorted(best, reverse=True)]
+
+
+class ColumnarForest:
+    """Struct-of-arrays forest.
+
+    The extrinsic state of every tree lives in typed columns, and each tree refers to
+    its shared TreeType through a small-int index into `tree_types`. No per-tree
+    objects are created unless a tree is explicitly requested.
+
+    Passing `cell_size` maintains a UniformGrid over the tree positions, which is
+    updated on every insert and used by the region and nearest-neighbour queries.
+    """
+
+    def __init__(self, cell_size: int | None = None) -> None:
+        self.xs = array("i")
+        self.ys = array("i")
+        self.ages = array("i")
+        self.type_ids = array("H")
+        self.tree_types: list[TreeType] = []
+        self._type_ids: dict[tuple[str, str, str], int] = {}
+        self.index = UniformGrid(cell_size) if cell_size is not None else None
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self) -> Iterator[Tree]:
+        for i in range(len(self.xs)):
+            yield self.tree(i)
+
+    def _type_id(self, name: str, color: str, texture: str) -> int:
+        key = (name, color, texture)
+        type_id = self._type_ids.get(key)
+        if type_id is None:
+            type_id = len(self.tree_types)
+            if type_id > MAX_TYPE_ID:
+                raise OverflowError("Too many tree types for the type id column")
+            self.tree_types.append(TreeFactory.get_tree_type(name, color, texture))
+            self._type_ids[key] = type_id
+        return type_id
+
+    def plant_tree(
+        self, x: int, y: int, age: int, name: str, color: str, texture: str
+    ) -> None:
+        # Check that every value fits its column before appending to any of them.
+        array("i", (x, y, age))
+        type_id = self._type_id(name, color, texture)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.ages.append(age)
+        self.type_ids.append(type_id)
+        if self.index is not None:
+            self.index.insert(len(self.xs) - 1, x, y)
+
+    def plant_trees(
+        self,
+        xs: Sequence[int],
+        ys: Sequence[int],
+        ages: Sequence[int],
+        type_keys: Sequence[tuple[str, str, str]],
+    ) -> None:
+        """Plant a whole batch of trees given as columns.
+
+        Each distinct (name, color, texture) key is resolved to its TreeType once per
+        batch, and every column is extended in a single call.
+        """
+        if not len(xs) == len(ys) == len(ages) == len(type_keys):
+            raise ValueError("All columns must have the same length")
+        # Build every column before touching the forest, so a value that does not
+        # fit its column leaves the forest unchanged.
+        new_xs, new_ys, new_ages = array("i", xs), array("i", ys), array("i", ages)
+        resolved = {key: self._type_id(*key) for key in set(type_keys)}
+        type_ids = array("H", map(resolved.__getitem__, type_keys))
+        start = len(self.xs)
+        self.xs.extend(new_xs)
+        self.ys.extend(new_ys)
+        self.ages.extend(new_ages)
+        self.type_ids.extend(type_ids)
+        if self.index is not None:
+            for i in range(start, len(self.xs)):
+                self.index.insert(i, self.xs[i], self.ys[i])
+
+    def plant_tree_rows(
+        self, rows: Iterable[tuple[int, int, int, str, str, str]]
+    ) -> None:
+        columns = tuple(zip(*rows))
+        if not columns:
+            return
+        xs, ys, ages, names, colors, textures = columns
+        self.plant_trees(xs, ys, ages, list(zip(names, colors, textures)))
+
+    def tree(self, index: int) -> Tree:
+        tree_type = self.tree_types[self.type_ids[index]]
+        return Tree(self.xs[index], self.ys[index], self.ages[index], tree_type)
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[int]:
+        if self.index is not None:
+            yield from self.index.query(x0, y0, x1, y1, self.xs, self.ys)
+            return
+        for i in range(len(self.xs)):
+            if x0 <= self.xs[i] <= x1 and y0 <= self.ys[i] <= y1:
+                yield i
+
+    def nearest(self, x: int, y: int, k: int = 1) -> list[int]:
+        if self.index is not None:
+            return self.index.nearest(x, y, k, self.xs, self.ys)
+        return heapq.nsmallest(
+            k,
+            range(len(self.xs)),
+            key=lambda i: (self.xs[i] - x) ** 2 + (self.ys[i] - y) ** 2,
+        )
+
+    def trees_in_region(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[Tree]:
+        for i in self.region(x0, y0, x1, y1):
+            yield self.tree(i)
+
+    def nearest_trees(self, x: int, y: int, k: int = 1) -> list[Tree]:
+        return [self.tree(i) for i in self.nearest(x, y, k)]
+
+    def display_forest(self) -> None:
+        for i in range(len(self.xs)):
+            self._display(i)
+
+    def display_region(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        for i in self.region(x0, y0, x1, y1):
+            self._display(i)
+
+    def _display(self, index: int) -> None:
+        tree_type = self.tree_types[self.type_ids[index]]
+        tree_type.display(self.xs[index], self.ys[index], self.ages[index])
+
+    def save(self, path: str) -> None:
+        """Write the forest as a header, a TreeType table and fixed-width columns.
+
+        Columns are stored in native byte order and aligned to 4 bytes, so that
+        `load` can map them straight into memory.
+        """
+        with open(path, "wb") as file:
+            file.write(
+                FOREST_HEADER.pack(
+                    FOREST_MAGIC,
+                    FOREST_VERSION,
+                    BYTE_ORDER_MARK,
+                    len(self.xs),
+                    len(self.tree_types),
+                )
+            )
+            for tree_type in self.tree_types:
+                for field in (tree_type.name, tree_type.color, tree_type.texture):
+                    encoded = field.encode()
+                    file.write(STRING_LENGTH.pack(len(encoded)))
+                    file.write(encoded)
+            file.write(b"\0" * (-file.tell() % 4))
+            for column in (self.xs, self.ys, self.ages, self.type_ids):
+                file.write(column)
+
+    @classmethod
+    def load(cls, path: str, cell_size: int | None = None) -> "MappedForest":
+        return MappedForest(path, cell_size)
+
+
+class MappedForest(ColumnarForest):
+    """Read-only forest whose columns are views into a memory-mapped file.
+
+    Nothing is copied and no per-tree objects are created on load, so several
+    processes mapping the same file share its pages through the page cache.
+    """
+
+    def __init__(self, path: str, cell_size: int | None = None) -> None:
+        super().__init__()
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        def fail(reason: str) -> NoReturn:
+            for column in columns:
+                column.release()
+            buffer.release()
+            self.close()
+            raise ValueError(f"{path} {reason}")
+
+        columns: list[memoryview] = []
+        if len(buffer) < FOREST_HEADER.size:
+            fail("is not a forest file")
+        magic, version, byte_order_mark, count, type_count = (
+            FOREST_HEADER.unpack_from(buffer)
+        )
+        if magic != FOREST_MAGIC or version != FOREST_VERSION:
+            fail("is not a forest file")
+        if byte_order_mark != BYTE_ORDER_MARK:
+            fail("was written with a different byte order")
+
+        offset = FOREST_HEADER.size
+        for _ in range(type_count):
+            fields = []
+            for _ in range(3):
+                if offset + STRING_LENGTH.size > len(buffer):
+                    fail("is truncated")
+                (length,) = STRING_LENGTH.unpack_from(buffer, offset)
+                offset += STRING_LENGTH.size
+                if offset + length > len(buffer):
+                    fail("is truncated")
+                fields.append(str(buffer[offset : offset + length], "utf-8"))
+                offset += length
+            self._type_id(*fields)
+        offset += -offset % 4
+
+        for typecode in ("i", "i", "i", "H"):
+            size = count * array(typecode).itemsize
+            if offset + size > len(buffer):
+                fail("is truncated")
+            columns.append(buffer[offset : offset + size].cast(typecode))
+            offset += size
+        self.xs, self.ys, self.ages, self.type_ids = columns
+        buffer.release()
+
+        if cell_size is not None:
+            self.index = UniformGrid(cell_size)
+            for i in range(count):
+                self.index.insert(i, self.xs[i], self.ys[i])
+
+    def plant_tree(
+        self, x: int, y: int, age: int, name: str, color: str, texture: str
+    ) -> None:
+        raise TypeError("MappedForest is read-only")
+
+    def plant_trees(
+        self,
+        xs: Sequence[int],
+        ys: Sequence[int],
+        ages: Sequence[int],
+        type_keys: Sequence[tuple[str, str, str]],
+    ) -> None:
+        raise TypeError("MappedForest is read-only")
+
+    def close(self) -> None:
+        for column in (self.xs, self.ys, self.ages, self.type_ids):
+            if isinstance(column, memoryview):
+                column.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedForest":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def benchmark(sizes: tuple[int, ...] = (100_000, 200_000, 400_000)) -> None:
+    tree_type = TreeType("Oak", "Green", "Rough")
+    for n in sizes:
+        forest = ColumnarForest()
+        start = time.perf_counter()
+        for i in range(n):
+            forest.plant_tree(i, i, i % 100, "Oak", "Green", "Rough")
+        elapsed = time.perf_counter() - start
+        print(f"ColumnarForest: planted {n} trees in {elapsed:.3f}s")
+
+    n = sizes[-1]
+    xs = list(range(n))
+    ages = [i % 100 for i in range(n)]
+    type_keys = [("Oak", "Green", "Rough"), ("Birch", "White", "Smooth")] * (n // 2)
+    forest = ColumnarForest()
+    start = time.perf_counter()
+    forest.plant_trees(xs, xs, ages, type_keys)
+    elapsed = time.perf_counter() - start
+    print(f"ColumnarForest.plant_trees: planted {n} trees in {elapsed:.3f}s")
+
+    rng = random.Random(0)
+    points = [rng.randrange(100_000) for _ in range(2 * n)]
+    for label, cell_size in (("linear scan", None), ("UniformGrid", 1_000)):
+        forest = ColumnarForest(cell_size)
+        forest.plant_trees(points[:n], points[n:], ages, type_keys)
+        start = time.perf_counter()
+        found = sum(1 for _ in forest.region(40_000, 40_000, 42_000, 42_000))
+        forest.nearest(50_000, 50_000, k=10)
+        elapsed = time.perf_counter() - start
+        print(f"Region + 10-NN query ({label}): {found} trees in {elapsed:.4f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "forest.bin")
+        forest.save(path)
+        start = time.perf_counter()
+        rebuilt = ColumnarForest()
+        rebuilt.plant_trees(points[:n], points[n:], ages, type_keys)
+        rebuild_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        with ColumnarForest.load(path) as mapped:
+            load_elapsed = time.perf_counter() - start
+            assert mapped.tree(n - 1).x == rebuilt.tree(n - 1).x
+        print(f"Rebuild {n} trees: {rebuild_elapsed:.4f}s")
+        print(f"Load {n} trees with mmap: {load_elapsed:.6f}s")
+
+    n = sizes[0]
+    tracemalloc.start()
+    trees = [Tree(i, i, i % 100, tree_type) for i in range(n)]
+    object_bytes = tracemalloc.get_traced_memory()[0]
+    del trees
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    forest = ColumnarForest()
+    for i in range(n):
+        forest.plant_tree(i, i, i % 100, "Oak", "Green", "Rough")
+    columnar_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Tree objects: {object_bytes / n:.1f} bytes per tree")
+    print(f"ColumnarForest: {columnar_bytes / n:.1f} bytes per tree")
+
+
 if __name__ == "__main__":
     forest = Forest()
     forest.plant_tree(1, 2, 5, "Oak", "Green", "Rough")
     forest.plant_tree(3, 4, 10, "Oak", "Green", "Rough")
     forest.plant_tree(5, 6, 15, "Birch", "White", "Smooth")
     forest.display_forest()
+    print(f"TreeFactory: {TreeFactory.stats()}")
+
+    columnar_forest = ColumnarForest()
+    columnar_forest.plant_tree(1, 2, 5, "Oak", "Green", "Rough")
+    columnar_forest.plant_tree(3, 4, 10, "Oak", "Green", "Rough")
+    columnar_forest.plant_tree(5, 6, 15, "Birch", "White", "Smooth")
+    columnar_forest.plant_tree_rows(
+        [
+            (7, 8, 20, "Pine", "Dark Green", "Needles"),
+            (9, 10, 3, "Oak", "Green", "Rough"),
+        ]
+    )
+    columnar_forest.display_forest()
+
+    indexed_forest = ColumnarForest(cell_size=4)
+    for x, y, age in ((1, 2, 5), (3, 4, 10), (5, 6, 15), (20, 20, 7)):
+        indexed_forest.plant_tree(x, y, age, "Oak", "Green", "Rough")
+    indexed_forest.display_region(0, 0, 4, 4)
+    for tree in indexed_forest.nearest_trees(19, 18, k=2):
+        tree.display()
+
+    benchmark()
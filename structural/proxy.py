@@ -7,7 +7,16 @@ functionality like access control, lazy initialization, logging etc., without
 changing the object's code.
 """
 
-from typing import Protocol
+import asyncio
+import bisect
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
 
 
 class Book(Protocol):
@@ -20,18 +29,350 @@ class RealBook:
         self.content = content
 
     def display_content(self) -> None:
-        self.read_book = real_book
+        print(self.content)
+
+
+class AccessMetrics:
+    """Access counter and latency histogram sharded per thread.
+
+    Each thread increments only its own shard, so the hot path takes no lock; the
+    lock is held only while a thread registers its shard. Shards are summed on read.
+    """
+
+    # Upper bounds of the latency buckets in seconds; a final bucket is unbounded.
+    BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+    def __init__(self, record_latency: bool = False) -> None:
+        self.record_latency = record_latency
+        self._local = threading.local()
+        self._shards: list[list[int]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list[int]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            # Slot 0 is the access count, followed by one slot per latency bucket.
+            shard = [0] * (len(self.BUCKETS) + 2)
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def record(self, latency: float | None = None) -> None:
+        shard = self._shard()
+        shard[0] += 1
+        if latency is not None:
+            shard[bisect.bisect_left(self.BUCKETS, latency) + 1] += 1
+
+    def count(self) -> int:
+        with self._lock:
+            shards = list(self._shards)
+        return sum(shard[0] for shard in shards)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            shards = list(self._shards)
+        slots = len(self.BUCKETS) + 2
+        totals = [sum(shard[i] for shard in shards) for i in range(slots)]
+        labels = [f"<={bound:g}s" for bound in self.BUCKETS]
+        labels.append(f">{self.BUCKETS[-1]:g}s")
+        snapshot: dict[str, object] = {"count": totals[0]}
+        if self.record_latency:
+            snapshot["latency"] = dict(zip(labels, totals[1:]))
+        return snapshot
 
 
 class BookProxy:
-    def __init__(self, real_book: RealBook) -> None:
+    def __init__(self, real_book: RealBook, record_latency: bool = False) -> None:
         self.read_book = real_book
-        self.access_count = 0
+        self.metrics = AccessMetrics(record_latency)
+
+    @property
+    def access_count(self) -> int:
+        return self.metrics.count()
 
     def display_content(self) -> None:
-        self.access_count += 1
-        print(f"Displaying content for the {self.access_count} time(s).")
-        self.read_book.display_content()
+        if not self.metrics.record_latency:
+            self.metrics.record()
+            self.read_book.display_content()
+            return
+        start = time.perf_counter()
+        try:
+            self.read_book.display_content()
+        finally:
+            self.metrics.record(time.perf_counter() - start)
+
+
+class ContentCache:
+    """Thread-safe LRU cache of book contents bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple[str, int, int], tuple[str, int]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, int, int]) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple[str, int, int], content: str) -> None:
+        size = len(content.encode())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (content, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+
+shared_content_cache = ContentCache(64 * 1024 * 1024)
+
+
+class LazyBookProxy:
+    """Virtual proxy holding only the location of a book's content.
+
+    The content is read from `length` bytes at `offset` in `path` (the rest of the
+    file when `length` is -1) on first display and kept in a shared ContentCache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        offset: int = 0,
+        length: int = -1,
+        cache: ContentCache | None = None,
+    ) -> None:
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.cache = shared_content_cache if cache is None else cache
+
+    def _load(self) -> str:
+        with open(self.path, "rb") as file:
+            file.seek(self.offset)
+            return file.read(self.length).decode()
+
+    def display_content(self) -> None:
+        key = (self.path, self.offset, self.length)
+        content = self.cache.get(key)
+        if content is None:
+            content = self._load()
+            self.cache.put(key, content)
+        RealBook(content).display_content()
+
+
+# Every message is JSON preceded by its length in bytes.
+FRAME_HEADER = struct.Struct("!I")
+
+
+async def _write_frame(writer: asyncio.StreamWriter, message: object) -> None:
+    payload = json.dumps(message).encode()
+    writer.write(FRAME_HEADER.pack(len(payload)) + payload)
+    await writer.drain()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    return json.loads(await reader.readexactly(length))
+
+
+class BookServer:
+    """Local stand-in for a remote book store.
+
+    Each request is a frame of JSON holding a list of book ids, and each response is
+    a frame of JSON mapping those ids to their content. `delay` simulates the cost of
+    one round-trip.
+    """
+
+    def __init__(self, books: dict[str, str], delay: float = 0.0) -> None:
+        self.books = books
+        self.delay = delay
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    book_ids = await _read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                response = {book_id: self.books.get(book_id) for book_id in book_ids}
+                await _write_frame(writer, response)
+        finally:
+            writer.close()
+
+
+class BookClient:
+    """Pooled client for a BookServer that coalesces and batches fetches.
+
+    Concurrent fetches of the same book share one pending future. Fetches made
+    within `batch_window` seconds of each other are sent as one request over a
+    connection taken from a pool of at most `pool_size` connections.
+    """
+
+    def __init__(
+        self, host: str, port: int, pool_size: int = 4, batch_window: float = 0.001
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self._connections: asyncio.Queue[
+            tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        ] = asyncio.Queue()
+        self._slots = asyncio.Semaphore(pool_size)
+        self._inflight: dict[str, asyncio.Future[str]] = {}
+        self._pending: list[str] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def fetch(self, book_id: str) -> str:
+        future = self._inflight.get(book_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[book_id] = future
+            self._pending.append(book_id)
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+        return await asyncio.shield(future)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        book_ids, self._pending = self._pending, []
+        self._flush_task = None
+        await self._send(book_ids)
+
+    async def _send(self, book_ids: list[str]) -> None:
+        async with self._slots:
+            writer = None
+            try:
+                if self._connections.empty():
+                    connection = await asyncio.open_connection(self.host, self.port)
+                else:
+                    connection = self._connections.get_nowait()
+                reader, writer = connection
+                await _write_frame(writer, book_ids)
+                response = await _read_frame(reader)
+            except Exception as error:
+                if writer is not None:
+                    writer.close()
+                for book_id in book_ids:
+                    self._inflight.pop(book_id).set_exception(error)
+                return
+            self._connections.put_nowait(connection)
+        for book_id in book_ids:
+            future = self._inflight.pop(book_id)
+            content = response.get(book_id)
+            if content is None:
+                future.set_exception(KeyError(book_id))
+            else:
+                future.set_result(content)
+
+    async def close(self) -> None:
+        while not self._connections.empty():
+            _, writer = self._connections.get_nowait()
+            writer.close()
+            await writer.wait_closed()
+
+
+class RemoteBookProxy:
+    """Remote proxy fetching a book's content from a BookServer on every display."""
+
+    def __init__(self, book_id: str, client: BookClient) -> None:
+        self.book_id = book_id
+        self.client = client
+
+    async def display_content(self) -> None:
+        content = await self.client.fetch(self.book_id)
+        RealBook(content).display_content()
+
+
+async def benchmark(
+    requests: int = 1_000, books: int = 200, delay: float = 0.001
+) -> None:
+    server = BookServer({str(i): f"Book {i}" for i in range(books)}, delay)
+    host, port = await server.start()
+    book_ids = [str(i % books) for i in range(requests)]
+
+    reader, writer = await asyncio.open_connection(host, port)
+    start = time.perf_counter()
+    for book_id in book_ids:
+        await _write_frame(writer, [book_id])
+        await _read_frame(reader)
+    blocking_elapsed = time.perf_counter() - start
+    writer.close()
+    await writer.wait_closed()
+
+    client = BookClient(host, port)
+    server.requests = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(client.fetch(book_id) for book_id in book_ids))
+    batched_elapsed = time.perf_counter() - start
+    await client.close()
+    await server.close()
+
+    print(
+        f"One request per fetch: {requests / blocking_elapsed:.0f} fetches/s, "
+        f"{blocking_elapsed / requests * 1000:.3f}ms per fetch"
+    )
+    print(
+        f"BookClient: {requests / batched_elapsed:.0f} fetches/s "
+        f"in {server.requests} round-trip(s)"
+    )
+
+
+async def serve_remote_books() -> None:
+    server = BookServer({"1984": "It was a bright cold day in April."})
+    host, port = await server.start()
+    client = BookClient(host, port)
+    remote_book = RemoteBookProxy("1984", client)
+    await asyncio.gather(remote_book.display_content(), remote_book.display_content())
+    print(f"Round-trips: {server.requests}")
+    await client.close()
+    await server.close()
+
+
+async def fetch_large_books() -> None:
+    books = {
+        "large": "x" * 70_000,
+        "first": "y" * 40_000,
+        "second": "z" * 40_000,
+    }
+    server = BookServer(books)
+    host, port = await server.start()
+    client = BookClient(host, port)
+    assert await client.fetch("large") == books["large"]
+    first, second = await asyncio.gather(client.fetch("first"), client.fetch("second"))
+    assert (first, second) == (books["first"], books["second"])
+    print(f"Fetched books over 64 KiB in {server.requests} round-trip(s)")
+    await client.close()
+    await server.close()
 
 
 if __name__ == "__main__":
@@ -39,3 +380,23 @@ if __name__ == "__main__":
     proxy_book = BookProxy(real_book)
     proxy_book.display_content()
     proxy_book.display_content()
+    print(f"Access count: {proxy_book.access_count}")
+
+    timed_proxy_book = BookProxy(real_book, record_latency=True)
+    timed_proxy_book.display_content()
+    print(timed_proxy_book.metrics.snapshot())
+
+    cache = ContentCache(max_bytes=32)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalogue.txt")
+        with open(path, "w") as file:
+            file.write("First book contents.Second book contents.")
+        first_book = LazyBookProxy(path, 0, 20, cache)
+        second_book = LazyBookProxy(path, 20, 21, cache)
+        first_book.display_content()
+        second_book.display_content()
+        print(f"Cached bytes: {cache.size}")
+
+    asyncio.run(serve_remote_books())
+    asyncio.run(fetch_large_books())
+    asyncio.run(benchmark())